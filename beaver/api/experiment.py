@@ -15,13 +15,13 @@ from beaver import db, logic, models
 router = fastapi.APIRouter()
 
 
-@typing.runtime_checkable
+# These protocols describe what a model has to implement. They're not runtime checkable, because
+# isinstance checks against protocols are slow. Instead, _has_methods checks the methods directly.
 class Model(typing.Protocol):
     def predict(self, x: dict) -> typing.Any:
         ...
 
 
-@typing.runtime_checkable
 class ModelThatCanLearn(typing.Protocol):
     def predict(self, x: dict) -> typing.Any:
         ...
@@ -30,6 +30,22 @@ class ModelThatCanLearn(typing.Protocol):
         ...
 
 
+def _has_methods(obj, methods: tuple[str, ...]) -> bool:
+    # The SDK attaches predict and learn to river models as instance attributes, so this has to
+    # look at the instance, not its class
+    return all(callable(getattr(obj, method, None)) for method in methods)
+
+
+def _decode_model(model: str) -> tuple[typing.Any, bytes]:
+    """Return the model object along with its raw serialized bytes.
+
+    The raw bytes are what gets stored as the model state, which avoids dumping the model again.
+
+    """
+    raw = base64.b64decode(model)
+    return dill.loads(raw), raw
+
+
 class ExperimentOut(pydantic.BaseModel):
     name: str
     sync_seconds: str | None
@@ -51,14 +67,20 @@ def create_experiment(
     if not project:
         raise fastapi.HTTPException(status_code=404, detail="Project not found")
 
-    model_obj = dill.loads(base64.b64decode(experiment.model.decode("ascii")))
-    if not isinstance(model_obj, Model):
+    if not experiment.model:
+        raise fastapi.HTTPException(status_code=400, detail="Model is missing")
+
+    model_obj, model_state = _decode_model(experiment.model.decode("ascii"))
+    if not _has_methods(model_obj, ("predict",)):
         raise fastapi.HTTPException(
             status_code=400, detail="Model does not implement the expected protocol"
         )
 
-    experiment.can_learn = isinstance(model_obj, ModelThatCanLearn)
-    experiment.model_state = dill.dumps(model_obj)
+    experiment.can_learn = _has_methods(model_obj, ("predict", "learn"))
+    # The payload was produced with dill by the SDK, so it's stored as is. Subsequent checkpoints
+    # will switch to pickle when the model allows it.
+    experiment.model_state = models.experiment.DILL_TAG + model_state
+    experiment.model = b""
     experiment.save(session)
 
     # Run inference and learning jobs
@@ -1,7 +1,7 @@
 import fastapi
 import sqlmodel as sqlm
 
-from beaver import db, models
+from beaver import db, enums, models
 
 router = fastapi.APIRouter()
 
@@ -11,6 +11,13 @@ def create_job_runner(
     job_runner: models.JobRunner,
     session: sqlm.Session = fastapi.Depends(db.get_session),
 ):
+    # The thread job runner's sessions would share the request handlers' transaction
+    is_thread = job_runner.protocol == enums.JobRunner.thread
+    if is_thread and db.is_shared_connection(session):
+        raise fastapi.HTTPException(
+            status_code=400,
+            detail="The thread job runner requires a database which isn't in-memory",
+        )
     job_runner.save(session)
     return job_runner
 
@@ -56,3 +56,15 @@ def send_message(
     if not message_bus:
         raise fastapi.HTTPException(status_code=404, detail="Message bus not found")
     message_bus.infra.send(message)
+
+
+@router.post("/{name}/bulk", status_code=201)
+def send_messages(
+    name: str,
+    messages: list[infra.Message],
+    session: sqlm.Session = fastapi.Depends(db.get_session),
+):
+    message_bus = session.get(models.MessageBus, name)
+    if not message_bus:
+        raise fastapi.HTTPException(status_code=404, detail="Message bus not found")
+    message_bus.infra.send_many(messages)
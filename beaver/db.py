@@ -1,20 +1,42 @@
 import contextlib
+import inspect
 import os
+import sqlalchemy
 import sqlmodel as sqlm
 import sqlmodel.pool
 
+from beaver.infra import sqlite
+
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite://")
 
-connect_args = (
-    {
-        "connect_args": {"check_same_thread": False},
-        "poolclass": sqlmodel.pool.StaticPool,
-    }
-    if DATABASE_URL.startswith("sqlite")
-    else {}
-)
-engine = sqlm.create_engine(DATABASE_URL, **connect_args)
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    sqlite.set_pragmas(dbapi_connection)
+
+
+def create_engine(url: str) -> sqlalchemy.engine.Engine:
+    if not url.startswith("sqlite"):
+        return sqlm.create_engine(url)
+
+    engine_args: dict = {"connect_args": {"check_same_thread": False}}
+    # An in-memory database only lives as long as its connection, so all the sessions have to
+    # share a single one. File databases use SQLAlchemy's default pool instead, which gives each
+    # session its own connection. Otherwise, sessions on different threads, such as the thread
+    # job runner's, would share the same transaction.
+    if sqlalchemy.engine.make_url(url).database in (None, "", ":memory:"):
+        engine_args["poolclass"] = sqlmodel.pool.StaticPool
+    engine = sqlm.create_engine(url, **engine_args)
+    sqlalchemy.event.listen(engine, "connect", set_sqlite_pragmas)
+    return engine
+
+
+engine = create_engine(DATABASE_URL)
+
+
+def is_shared_connection(session: sqlm.Session) -> bool:
+    """Whether the session's connection is shared with every other session."""
+    return isinstance(session.get_bind().pool, sqlmodel.pool.StaticPool)
 
 
 def create_db_and_tables():
@@ -31,13 +53,11 @@ def session():
     # HACK
     from beaver.main import app
 
-    session = None
+    # Overrides may either yield the session or return it
+    session = app.dependency_overrides.get(get_session, get_session)()
+    if inspect.isgenerator(session):
+        session = next(session)
     try:
-        session = next(app.dependency_overrides[get_session]())
-        yield session
-    except KeyError:
-        session = next(get_session())
         yield session
     finally:
-        if session is not None:
-            session.close()
+        session.close()
@@ -27,3 +27,4 @@ class JobRunner(str, enum.Enum):
     celery = "CELERY"
     rq = "RQ"
     synchronous = "SYNCHRONOUS"
+    thread = "THREAD"
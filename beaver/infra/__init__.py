@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from .job_runner import JobRunner, RQJobRunner, SynchronousJobRunner
+from .job_runner import JobRunner, RQJobRunner, SynchronousJobRunner, ThreadJobRunner
 from .message_bus import (
     KafkaMessageBus,
     Message,
@@ -25,5 +25,6 @@ __all__ = [
     "MaterializeStreamProcessor",
     "JobRunner",
     "SynchronousJobRunner",
+    "ThreadJobRunner",
     "RQJobRunner",
 ]
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import logging
+import queue
+import threading
 import typing
+import uuid
+from concurrent import futures
 
 import redis
 import rq
 
+logger = logging.getLogger(__name__)
+
+# How many distinct tasks, typically experiments, the thread job runner runs at the same time
+MAX_CONCURRENT_TASKS = 2
+
 
 class JobRunner(typing.Protocol):
     def start(self, task: typing.Callable) -> str:
@@ -22,6 +32,122 @@ class SynchronousJobRunner:
         pass
 
 
+class _Worker(threading.Thread):
+    """Background thread which runs the tasks submitted to the thread job runner.
+
+    Each task is handed to the pool as soon as it's dequeued, so distinct tasks, typically
+    different experiments, run concurrently. Identical tasks, for instance two progressive
+    learning runs for the same experiment, never run at the same time. A duplicate of a task
+    which hasn't started yet is dropped, because the latter will do the same work. A duplicate of
+    a running task is run once its twin is done, and further duplicates are coalesced into it.
+
+    """
+
+    def __init__(self):
+        super().__init__(name="beaver-job-runner", daemon=True)
+        self.tasks: queue.SimpleQueue = queue.SimpleQueue()
+        # IDs of the tasks that haven't started yet and haven't been cancelled
+        self.pending: set[str] = set()
+        # Signatures of the tasks that have been handed to the pool, mapped to whether they've
+        # started running
+        self.in_flight: dict[typing.Hashable, bool] = {}
+        # Duplicates of running tasks, which are queued again once their twin is done
+        self.deferred: dict[typing.Hashable, tuple[str, typing.Callable]] = {}
+        self.lock = threading.Lock()
+        self.pool = futures.ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENT_TASKS, thread_name_prefix="beaver-job"
+        )
+
+    def submit(self, task_id: str, task: typing.Callable) -> None:
+        with self.lock:
+            self.pending.add(task_id)
+        self.tasks.put((task_id, task))
+
+    def cancel(self, task_id: str) -> None:
+        # Cancelling a task which has already started is a no-op
+        with self.lock:
+            self.pending.discard(task_id)
+
+    def run(self):
+        while True:
+            task_id, task = self.tasks.get()
+            signature = _task_signature(task)
+            with self.lock:
+                if task_id not in self.pending:
+                    continue
+                if signature in self.in_flight:
+                    # The twin hasn't started yet, so it covers this task
+                    if not self.in_flight[signature]:
+                        self.pending.discard(task_id)
+                        continue
+                    # The twin is running, so this task waits for it. It stays pending, so that
+                    # it can still be cancelled.
+                    if (previous := self.deferred.get(signature)) is not None:
+                        self.pending.discard(previous[0])
+                    self.deferred[signature] = (task_id, task)
+                    continue
+                self.in_flight[signature] = False
+            self.pool.submit(self._execute, task_id, signature, task)
+
+    def _execute(self, task_id, signature, task):
+        try:
+            with self.lock:
+                if task_id not in self.pending:
+                    return
+                self.pending.discard(task_id)
+                self.in_flight[signature] = True
+            task()
+        except Exception:
+            # The worker must survive a failing task
+            logger.exception("Task %s failed", task_id)
+        finally:
+            with self.lock:
+                del self.in_flight[signature]
+                deferred = self.deferred.pop(signature, None)
+            if deferred is not None:
+                self.tasks.put(deferred)
+
+
+def _task_signature(task):
+    try:
+        signature = (task.func, task.args, tuple(sorted(task.keywords.items())))
+        hash(signature)
+    except (AttributeError, TypeError):
+        # Not a partial, or unhashable arguments: the task is only identical to itself
+        return task
+    return signature
+
+
+_worker: _Worker | None = None
+_worker_lock = threading.Lock()
+
+
+class ThreadJobRunner:
+    """Runs tasks on a background thread, so that the caller doesn't wait for them to finish.
+
+    The tasks open their own database sessions, so the database mustn't share a single connection
+    between sessions, as in-memory SQLite databases do.
+
+    """
+
+    @staticmethod
+    def _get_worker() -> _Worker:
+        global _worker
+        with _worker_lock:
+            if _worker is None:
+                _worker = _Worker()
+                _worker.start()
+        return _worker
+
+    def start(self, task):
+        task_id = str(uuid.uuid4())
+        self._get_worker().submit(task_id, task)
+        return task_id
+
+    def stop(self, task_id):
+        self._get_worker().cancel(task_id)
+
+
 class RQJobRunner:
     def __init__(self, redis_url):
         self.redis_url = redis_url
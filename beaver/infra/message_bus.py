@@ -1,9 +1,10 @@
 import datetime as dt
 import typing
 import kafka
-import sqlite3
 import pydantic
 
+from . import sqlite
+
 
 class Message(pydantic.BaseModel):
     topic: str
@@ -20,30 +21,45 @@ class MessageBus(typing.Protocol):
     def send(self, message: Message) -> None:
         ...
 
+    def send_many(self, messages: typing.Iterable[Message]) -> None:
+        ...
+
+
+# The statement is prepared once per executemany call, whatever the number of messages
+_SQLITE_INSERT_MESSAGE = (
+    "INSERT INTO messages (topic, key, value, created_at) VALUES (?, ?, ?, ?)"
+)
+
 
 class SQLiteMessageBus:
     def __init__(self, url: str):
         self.url = url
-        with sqlite3.connect(self.url) as con:
+        with sqlite.connect(self.url) as con:
             con.execute(
                 "CREATE TABLE IF NOT EXISTS messages(topic, key, value, created_at)"
             )
+            # Feature sets, targets, and predictions are all read by filtering on the topic
+            con.execute(
+                "CREATE INDEX IF NOT EXISTS messages_topic ON messages(topic, created_at)"
+            )
 
     @property
     def topic_names(self) -> typing.List[str]:
-        with sqlite3.connect(self.url) as con:
+        with sqlite.connect(self.url) as con:
             rows = con.execute("SELECT DISTINCT topic FROM messages").fetchall()
         return rows
 
     def send(self, message: Message) -> None:
-        with sqlite3.connect(self.url) as con:
-            con.execute(
-                "INSERT INTO messages (topic, key, value, created_at) VALUES (?, ?, ?, ?)",
+        self.send_many([message])
+
+    def send_many(self, messages: typing.Iterable[Message]) -> None:
+        # A single executemany inside one transaction, instead of a commit per message
+        with sqlite.connect(self.url) as con:
+            con.executemany(
+                _SQLITE_INSERT_MESSAGE,
                 (
-                    message.topic,
-                    message.key,
-                    message.value,
-                    message.created_at,
+                    (message.topic, message.key, message.value, message.created_at)
+                    for message in messages
                 ),
             )
 
@@ -65,6 +81,10 @@ class KafkaMessageBus(kafka.KafkaProducer):
             topic=message.topic, value=message.value, key=message.key
         )
 
+    def send_many(self, messages: typing.Iterable[Message]) -> None:
+        for message in messages:
+            self.send(message)
+
 
 class RedpandaMessageBus(KafkaMessageBus):
     ...
@@ -0,0 +1,26 @@
+import sqlite3
+
+
+# WAL journaling with NORMAL sync means a commit only appends to the WAL file instead of fsyncing the
+# main database, which makes the many small commits done by the message bus much cheaper. The busy
+# timeout lets concurrent connections wait for each other instead of raising SQLITE_BUSY.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def set_pragmas(con: sqlite3.Connection) -> None:
+    cursor = con.cursor()
+    for pragma in PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def connect(url: str) -> sqlite3.Connection:
+    con = sqlite3.connect(url)
+    set_pragmas(con)
+    return con
@@ -3,6 +3,8 @@ import psycopg
 import sqlite3
 import typing
 
+from . import sqlite
+
 
 class StreamProcessor(typing.Protocol):
     def execute(self, query: str):
@@ -25,17 +27,17 @@ class SQLiteStreamProcessor:
         self.url = url
 
     def execute(self, query):
-        with sqlite3.connect(self.url) as con:
+        with sqlite.connect(self.url) as con:
             con.execute(query)
 
     def query(self, query):
-        with sqlite3.connect(self.url) as con:
+        with sqlite.connect(self.url) as con:
             con.row_factory = sqlite3.Row
             rows = list(map(dict, con.execute(query)))
         yield from rows
 
     def create_view(self, name, query):
-        with sqlite3.connect(self.url) as con:
+        with sqlite.connect(self.url) as con:
             con.execute(f"DROP VIEW IF EXISTS {name}")
             con.execute(f"CREATE VIEW {name} AS {query}")
 
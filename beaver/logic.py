@@ -1,10 +1,18 @@
 import datetime as dt
-import json
 import uuid
+import orjson
 import sqlmodel as sqlm
 from beaver import db, enums, models, infra
 
 
+def _dumps(obj) -> str:
+    # Models may output NumPy scalars, and features may have non-str keys, which orjson only
+    # handles with these options
+    return orjson.dumps(
+        obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    ).decode()
+
+
 def iter_dataset_for_experiment(
     experiment: models.Experiment, since: dt.datetime, session: sqlm.Session = None
 ):
@@ -67,8 +75,8 @@ def iter_dataset_for_experiment(
             (
                 dt.datetime.fromisoformat(r["ts"]),
                 r["key"],
-                json.loads(r["features"]) if r["features"] else None,
-                json.loads(r["target"]) if r["target"] else None,
+                orjson.loads(r["features"]) if r["features"] else None,
+                orjson.loads(r["target"]) if r["target"] else None,
             )
             for r in project.stream_processor.infra.stream_view(
                 name=dataset_name, since=since
@@ -143,7 +151,7 @@ def iter_dataset_for_experiment(
         )
 
 
-def do_progressive_learning(experiment_name: str):
+def do_progressive_learning(experiment_name: str, commit_every: int = 50):
     """
 
     Progressive learning is the act of intervealing predictions and learning. It is specific to
@@ -169,6 +177,9 @@ def do_progressive_learning(experiment_name: str):
     The idea is that this functions is run in the background repeatidly. This way, the models stay
     up-to-date, and predictions are made as soon as possible.
 
+    Predictions are buffered and sent to the message bus in batches of `commit_every`, so that
+    each prediction doesn't incur its own write.
+
     """
 
     with db.session() as session:
@@ -191,6 +202,18 @@ def do_progressive_learning(experiment_name: str):
     # can be used for learning.
     features_used_for_predicting: dict[str, dict] = {}
 
+    predictions: list[infra.Message] = []
+
+    # These are looked up once, rather than for every sample. Attribute access on the models goes
+    # through SQLAlchemy's instrumentation, which is not free. Likewise, the job's counters are
+    # only written to the job when checkpointing.
+    # Models that can't learn, such as fitted sklearn estimators, only have a predict method
+    learn, predict = getattr(model, "learn", None), model.predict
+    is_binary_clf = project.task == enums.Task.binary_clf.value
+    predictions_topic_name = project.predictions_topic_name
+    project_name = project.name
+    n_learnings, n_predictions = job.n_learnings, job.n_predictions
+
     last_checkpoint = dt.datetime.now()
 
     for ts, key, features, label in iter_dataset_for_experiment(
@@ -198,37 +221,43 @@ def do_progressive_learning(experiment_name: str):
     ):
         # LEARNING
         if label is not None:
-            model.learn(features or features_used_for_predicting[key], label)
-            job.n_learnings += 1
+            learn(features or features_used_for_predicting[key], label)
+            n_learnings += 1
         # PREDICTING
         else:
-            y_pred = model.predict(features)
+            y_pred = predict(features)
 
             # Cast to appropriate type
-            if project.task == enums.Task.binary_clf.value:
+            if is_binary_clf:
                 y_pred = bool(y_pred)
 
             prediction_event = infra.Message(
-                topic=project.predictions_topic_name,
+                topic=predictions_topic_name,
                 key=str(uuid.uuid4()),
-                value=json.dumps(
+                value=_dumps(
                     {
                         "key": key,
-                        "project": project.name,
-                        "experiment": experiment.name,
-                        "prediction": json.dumps(y_pred),
-                        "features": json.dumps(features),
+                        "project": project_name,
+                        "experiment": experiment_name,
+                        "prediction": _dumps(y_pred),
+                        "features": _dumps(features),
                     }
                 ),
             )
-            message_bus.infra.send(prediction_event)
-            job.n_predictions += 1
+            predictions.append(prediction_event)
+            n_predictions += 1
             features_used_for_predicting[key] = features
+            if len(predictions) >= commit_every:
+                message_bus.infra.send_many(predictions)
+                predictions.clear()
         # Bookkeeping
         experiment.last_sample_ts = ts
 
         # Checkpoint every minute
         if (dt.datetime.now() - last_checkpoint).total_seconds() > 60:
+            message_bus.infra.send_many(predictions)
+            predictions.clear()
+            job.n_learnings, job.n_predictions = n_learnings, n_predictions
             with db.session() as session:
                 experiment.set_model(model)
                 session.add(experiment)
@@ -237,6 +266,8 @@ def do_progressive_learning(experiment_name: str):
                 session.refresh(experiment)
             last_checkpoint = dt.datetime.now()
     else:
+        message_bus.infra.send_many(predictions)
+        job.n_learnings, job.n_predictions = n_learnings, n_predictions
         with db.session() as session:
             experiment.set_model(model)
             session.add(experiment)
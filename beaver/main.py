@@ -9,7 +9,9 @@ import beaver_sdk
 
 
 app = fastapi.FastAPI(
-    title=settings.PROJECT_NAME, openapi_url=f"{settings.API_PREFIX}/openapi.json"
+    title=settings.PROJECT_NAME,
+    openapi_url=f"{settings.API_PREFIX}/openapi.json",
+    default_response_class=fastapi.responses.ORJSONResponse,
 )
 
 
@@ -1,13 +1,37 @@
 import datetime as dt
+import pickle
 import dill
 import sqlmodel
 
 from .base import Base
 
+# The model state is prefixed with a byte indicating which serializer produced it. The standard
+# pickle module is much faster than dill, so it's preferred whenever the model supports it.
+PICKLE_TAG = b"P"
+DILL_TAG = b"D"
+
+
+def dump_model(model) -> bytes:
+    try:
+        return PICKLE_TAG + pickle.dumps(model, protocol=5)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return DILL_TAG + dill.dumps(model, protocol=5)
+
+
+def load_model(state: bytes):
+    tag, payload = state[:1], state[1:]
+    if tag == PICKLE_TAG:
+        return pickle.loads(payload)
+    if tag == DILL_TAG:
+        return dill.loads(payload)
+    # Untagged states were produced by dill
+    return dill.loads(state)
+
 
 class Experiment(Base, table=True):  # type: ignore[call-arg]
     # Attributes
     name: str = sqlmodel.Field(primary_key=True)
+    # The base64 payload sent by the SDK. It's emptied once it's been decoded into model_state.
     model: bytes
     can_learn: bool = sqlmodel.Field(default=False)
     model_state: bytes | None = sqlmodel.Field(default=None)
@@ -29,7 +53,7 @@ class Experiment(Base, table=True):  # type: ignore[call-arg]
     )
 
     def get_model(self):
-        return dill.loads(self.model_state)
+        return load_model(self.model_state)
 
     def set_model(self, model):
-        self.model_state = dill.dumps(model)
+        self.model_state = dump_model(model)
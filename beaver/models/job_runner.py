@@ -22,6 +22,8 @@ class JobRunner(Base, table=True):  # type: ignore[call-arg]
     def infra(self):
         if self.protocol == enums.JobRunner.synchronous:
             return _infra.SynchronousJobRunner()
+        if self.protocol == enums.JobRunner.thread:
+            return _infra.ThreadJobRunner()
         if self.protocol == enums.JobRunner.celery:
             return _infra.CeleryJobRunner(self.url)
         if self.protocol == enums.JobRunner.rq:
@@ -1,16 +1,24 @@
+import functools
 import pathlib
 import urllib.parse
 import pytest
 from fastapi.testclient import TestClient
+import sqlalchemy
 import sqlmodel
 import sqlmodel.pool
 from river import datasets, linear_model, preprocessing
 
 from beaver.main import app
+from beaver import db
 from beaver.db import get_session
 import beaver_sdk
 
 
+@functools.lru_cache(maxsize=1)
+def _phishing_samples():
+    return tuple(datasets.Phishing().take(15))
+
+
 @pytest.fixture(name="session")
 def session_fixture():
     engine_ = sqlmodel.create_engine(
@@ -18,6 +26,7 @@ def session_fixture():
         connect_args={"check_same_thread": False},
         poolclass=sqlmodel.pool.StaticPool,
     )
+    sqlalchemy.event.listen(engine_, "connect", db.set_sqlite_pragmas)
     sqlmodel.SQLModel.metadata.create_all(engine_)
     with sqlmodel.Session(engine_) as session:
         yield session
@@ -27,21 +36,26 @@ def session_fixture():
 def client(session: sqlmodel.Session):
     """HACK: this is an override so that the Beaver SDK talks to the TestClient, instead of requests"""
 
+    # Returning the session, rather than yielding it, spares FastAPI from entering and exiting a
+    # generator for each request
     def get_session_override():
-        yield session
+        return session
 
     def request_override(*args, **kwargs):
         self, *args = args
         method, endpoint, *args = args
-        endpoint = urllib.parse.urljoin(self.host, endpoint)
+        if self.host:
+            endpoint = urllib.parse.urljoin(self.host, endpoint)
         r = client.request(method, endpoint, *args, **kwargs)
         r.raise_for_status()
         return r.json()
 
     app.dependency_overrides[get_session] = get_session_override
-    client = TestClient(app)
     beaver_sdk.SDK.request = request_override
-    yield client
+    # Using the client as a context manager keeps a single event loop running for the whole test,
+    # instead of spinning one up for each request
+    with TestClient(app) as client:
+        yield client
     app.dependency_overrides.clear()
 
 
@@ -54,7 +68,9 @@ def sdk(client):
 def sqlite_mb_path():
     here = pathlib.Path(__file__).parent
     yield here / "message_bus.db"
-    (here / "message_bus.db").unlink(missing_ok=True)
+    # WAL mode leaves -wal and -shm files next to the database
+    for name in ["message_bus.db", "message_bus.db-wal", "message_bus.db-shm"]:
+        (here / name).unlink(missing_ok=True)
 
 
 def test_phishing(sdk, sqlite_mb_path):
@@ -75,8 +91,10 @@ def test_phishing(sdk, sqlite_mb_path):
 
     # Send 10 samples, without revealing answers
     message_bus = sdk.message_bus("test_mb")
-    for i, (x, _) in enumerate(datasets.Phishing().take(10)):
-        message_bus.send(topic="phishing_project_features", key=i, value=x)
+    message_bus.send_many(
+        ("phishing_project_features", i, x)
+        for i, (x, _) in enumerate(_phishing_samples()[:10])
+    )
 
     # Create a target
     project.target.set(
@@ -123,8 +141,10 @@ def test_phishing(sdk, sqlite_mb_path):
     assert state["experiments"]["phishing_experiment_2"]["accuracy"] == 0
 
     # The first 10 samples were sent without labels -- send them in now
-    for i, (_, y) in enumerate(datasets.Phishing().take(10)):
-        message_bus.send(topic="phishing_project_targets", key=i, value=y)
+    message_bus.send_many(
+        ("phishing_project_targets", i, y)
+        for i, (_, y) in enumerate(_phishing_samples()[:10])
+    )
 
     # We're using a synchronous task runner. Therefore, even though the labels have been sent, the
     # experiments are not automatically picking them up for learning. We have to explicitely make
@@ -142,11 +162,11 @@ def test_phishing(sdk, sqlite_mb_path):
     assert state["experiments"]["phishing_experiment_2"]["accuracy"] == 0.3
 
     # Send next 5 samples, with labels
-    for i, (x, y) in enumerate(datasets.Phishing().take(15)):
-        if i < 10:
-            continue
-        message_bus.send(topic="phishing_project_features", key=i, value=x)
-        message_bus.send(topic="phishing_project_targets", key=i, value=y)
+    messages = []
+    for i, (x, y) in enumerate(_phishing_samples()[10:15], start=10):
+        messages.append(("phishing_project_features", i, x))
+        messages.append(("phishing_project_targets", i, y))
+    message_bus.send_many(messages)
 
     # Run the models
     exp1.start()
@@ -1,5 +1,14 @@
+import base64
+import json
+import threading
+import time
+
+import dill
+import pytest
 from fastapi.testclient import TestClient
+import sqlmodel
 
+from beaver import db, logic, models
 from beaver.main import app
 
 client = TestClient(app)
@@ -8,3 +17,172 @@ client = TestClient(app)
 def test_read_main():
     response = client.get("/docs")
     assert response.status_code == 200
+
+
+class Constant:
+    def predict(self, x):
+        return 0
+
+
+@pytest.fixture
+def job_runner_protocol():
+    return "SYNCHRONOUS"
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path, job_runner_protocol):
+    # The thread job runner refuses in-memory databases, because their sessions all
+    # share the same connection
+    if job_runner_protocol == "THREAD":
+        engine = db.create_engine(f"sqlite:///{tmp_path / 'beaver.db'}")
+    else:
+        engine = db.create_engine("sqlite://")
+    sqlmodel.SQLModel.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture(name="session")
+def session_fixture(engine):
+    with sqlmodel.Session(engine) as session:
+        yield session
+
+
+@pytest.fixture(name="project_client")
+def project_client_fixture(engine, tmp_path, job_runner_protocol):
+    """Client with a project set up, which uses the job_runner_protocol job runner."""
+
+    # Each request gets its own session, as the thread job runner's can't be shared
+    def get_session_override():
+        with sqlmodel.Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[db.get_session] = get_session_override
+    with TestClient(app) as client:
+        url = str(tmp_path / "message_bus.db")
+        response = client.post(
+            "/api/message-bus/", json={"name": "mb", "protocol": "SQLITE", "url": url}
+        )
+        assert response.status_code == 201
+        response = client.post(
+            "/api/stream-processor/",
+            json={"name": "sp", "protocol": "SQLITE", "url": url},
+        )
+        assert response.status_code == 201
+        response = client.post(
+            "/api/job-runner/", json={"name": "jr", "protocol": job_runner_protocol}
+        )
+        assert response.status_code == 201
+        response = client.post(
+            "/api/project/",
+            json={
+                "name": "project",
+                "task": "BINARY_CLASSIFICATION",
+                "message_bus_name": "mb",
+                "stream_processor_name": "sp",
+                "job_runner_name": "jr",
+            },
+        )
+        assert response.status_code == 201
+        yield client
+    app.dependency_overrides.clear()
+
+
+def create_experiment(client, payload: bytes, **fields):
+    return client.post(
+        "/api/experiment/",
+        json={
+            "name": "experiment",
+            "project_name": "project",
+            "feature_set_name": "features",
+            "model": base64.b64encode(payload).decode("ascii"),
+            **fields,
+        },
+    )
+
+
+def test_create_experiment_stores_uploaded_payload(
+    project_client, session, monkeypatch
+):
+    monkeypatch.setattr(logic, "do_progressive_learning", lambda name: None)
+    payload = dill.dumps(Constant())
+
+    response = create_experiment(project_client, payload)
+    assert response.status_code == 201
+
+    experiment = session.get(models.Experiment, "experiment")
+    assert experiment.model_state == models.experiment.DILL_TAG + payload
+    assert experiment.model == b""
+    assert experiment.get_model().predict({}) == 0
+
+
+@pytest.mark.parametrize("job_runner_protocol", ["THREAD"])
+def test_create_experiment_does_not_wait_for_job(project_client, monkeypatch):
+    started, release, finished = threading.Event(), threading.Event(), threading.Event()
+
+    def do_progressive_learning(name):
+        started.set()
+        release.wait(5)
+        finished.set()
+
+    monkeypatch.setattr(logic, "do_progressive_learning", do_progressive_learning)
+
+    response = create_experiment(project_client, dill.dumps(Constant()))
+    assert response.status_code == 201
+    assert started.wait(5)
+    assert not finished.is_set()
+
+    release.set()
+    assert finished.wait(5)
+
+
+def test_thread_job_runner_refuses_in_memory_database(session):
+    app.dependency_overrides[db.get_session] = lambda: session
+    try:
+        response = client.post(
+            "/api/job-runner/", json={"name": "jr", "protocol": "THREAD"}
+        )
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("job_runner_protocol", ["THREAD"])
+def test_thread_job_runner_persists_progressive_learning(project_client, engine):
+    response = project_client.post(
+        "/api/feature-set/",
+        json={
+            "name": "features",
+            "project_name": "project",
+            "query": (
+                "SELECT key, created_at, value FROM messages WHERE topic = 'features'"
+            ),
+            "key_field": "key",
+            "ts_field": "created_at",
+            "value_field": "value",
+        },
+    )
+    assert response.status_code == 201
+    messages = [
+        {"topic": "features", "key": f"k{i}", "value": json.dumps({"x": i})}
+        for i in range(3)
+    ]
+    response = project_client.post("/api/message-bus/mb/bulk", json=messages)
+    assert response.status_code == 201
+
+    response = create_experiment(
+        project_client, dill.dumps(Constant()), start_from_top=True
+    )
+    assert response.status_code == 201
+
+    # The job is only saved once the progressive learning is done
+    deadline = time.monotonic() + 5
+    while True:
+        with sqlmodel.Session(engine) as session:
+            job = session.exec(sqlmodel.select(models.Job)).first()
+            experiment = session.get(models.Experiment, "experiment")
+        if job is not None or time.monotonic() > deadline:
+            break
+        time.sleep(0.05)
+    assert job is not None
+    assert job.n_predictions == 3
+    assert experiment.last_sample_ts is not None
@@ -0,0 +1,33 @@
+import threading
+
+import sqlmodel
+
+from beaver import db, models
+
+
+def test_file_database_sessions_dont_share_transactions(tmp_path):
+    engine = db.create_engine(f"sqlite:///{tmp_path / 'beaver.db'}")
+    sqlmodel.SQLModel.metadata.create_all(engine)
+
+    def open_and_close():
+        with sqlmodel.Session(engine) as session:
+            session.get(models.JobRunner, "jr")
+
+    with sqlmodel.Session(engine) as session:
+        session.add(models.JobRunner(name="jr", protocol="SYNCHRONOUS"))
+        session.flush()
+        # Closing a session on another thread mustn't roll back this one's transaction
+        thread = threading.Thread(target=open_and_close)
+        thread.start()
+        thread.join()
+        session.commit()
+        assert not db.is_shared_connection(session)
+
+    with sqlmodel.Session(engine) as session:
+        assert session.get(models.JobRunner, "jr") is not None
+
+
+def test_in_memory_database_is_shared():
+    engine = db.create_engine("sqlite://")
+    with sqlmodel.Session(engine) as session:
+        assert db.is_shared_connection(session)
@@ -0,0 +1,127 @@
+import contextlib
+import functools
+import threading
+import time
+
+import pytest
+
+from beaver import infra
+from beaver.infra import job_runner
+
+
+@pytest.fixture(name="runner")
+def thread_job_runner():
+    runner = infra.ThreadJobRunner()
+    yield runner
+    wait_idle(runner)
+
+
+def wait_idle(runner, timeout=5):
+    worker = runner._get_worker()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with worker.lock:
+            if not worker.pending and not worker.in_flight:
+                return
+        time.sleep(0.01)
+    raise TimeoutError
+
+
+@contextlib.contextmanager
+def busy(runner):
+    """Occupy every thread of the pool, so that the tasks started meanwhile wait for one."""
+    started = [threading.Event() for _ in range(job_runner.MAX_CONCURRENT_TASKS)]
+    release = threading.Event()
+
+    def block(i):
+        started[i].set()
+        release.wait(5)
+
+    for i in range(job_runner.MAX_CONCURRENT_TASKS):
+        runner.start(functools.partial(block, i))
+    assert all(event.wait(5) for event in started)
+    try:
+        yield
+        # Let the worker hand the tasks to the pool before releasing it
+        worker = runner._get_worker()
+        while not worker.tasks.empty():
+            time.sleep(0.01)
+    finally:
+        release.set()
+
+
+def test_identical_tasks_run_once(runner):
+    calls = []
+    with busy(runner):
+        runner.start(functools.partial(calls.append, "a"))
+        runner.start(functools.partial(calls.append, "a"))
+        runner.start(functools.partial(calls.append, "b"))
+    wait_idle(runner)
+    assert sorted(calls) == ["a", "b"]
+
+
+def test_duplicate_of_running_task_runs_after_it(runner):
+    calls = []
+    started, release = threading.Event(), threading.Event()
+
+    def learn(name):
+        calls.append(("start", name))
+        started.set()
+        release.wait(5)
+        calls.append(("end", name))
+
+    runner.start(functools.partial(learn, "a"))
+    assert started.wait(5)
+    # Both duplicates are coalesced into a single run, which waits for the first one
+    runner.start(functools.partial(learn, "a"))
+    runner.start(functools.partial(learn, "a"))
+    time.sleep(0.1)
+    release.set()
+    wait_idle(runner)
+    assert calls == [("start", "a"), ("end", "a")] * 2
+
+
+def test_tasks_started_in_sequence_run_concurrently(runner):
+    finished = {}
+    t0 = time.monotonic()
+
+    def work(name):
+        time.sleep(0.5)
+        finished[name] = time.monotonic() - t0
+
+    runner.start(functools.partial(work, "a"))
+    time.sleep(0.05)
+    runner.start(functools.partial(work, "b"))
+    wait_idle(runner)
+    assert finished["a"] < 0.9
+    assert finished["b"] < 0.9
+
+
+def test_stop_before_start(runner):
+    calls = []
+    with busy(runner):
+        task_id = runner.start(functools.partial(calls.append, "a"))
+        runner.stop(task_id)
+    wait_idle(runner)
+    assert calls == []
+
+
+def test_stop_after_run_is_forgotten(runner):
+    calls = []
+    task_id = runner.start(functools.partial(calls.append, "a"))
+    wait_idle(runner)
+    runner.stop(task_id)
+    assert calls == ["a"]
+    assert task_id not in job_runner._worker.pending
+
+
+def test_worker_survives_failing_task(runner):
+    def fail():
+        raise ValueError
+
+    runner.start(fail)
+    wait_idle(runner)
+    assert job_runner._worker.is_alive()
+    done = threading.Event()
+    runner.start(done.set)
+    assert done.wait(5)
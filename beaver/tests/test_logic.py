@@ -1,14 +1,14 @@
 import datetime as dt
 import json
-import functools
 import pathlib
 import pytest
+import sqlalchemy
 import sqlmodel
 import sqlmodel.pool
-from beaver import enums, infra, logic, models
+from beaver import db, enums, infra, logic, models
+from beaver.main import app
 
 
-@functools.cache
 @pytest.fixture(name="session")
 def session_fixture():
     engine = sqlmodel.create_engine(
@@ -16,6 +16,7 @@ def session_fixture():
         connect_args={"check_same_thread": False},
         poolclass=sqlmodel.pool.StaticPool,
     )
+    sqlalchemy.event.listen(engine, "connect", db.set_sqlite_pragmas)
     sqlmodel.SQLModel.metadata.create_all(engine)
     with sqlmodel.Session(engine) as session:
         return session
@@ -25,7 +26,9 @@ def session_fixture():
 def sqlite_mb_path():
     here = pathlib.Path(__file__).parent
     yield here / "message_bus.db"
-    (here / "message_bus.db").unlink(missing_ok=True)
+    # WAL mode leaves -wal and -shm files next to the database
+    for name in ["message_bus.db", "message_bus.db-wal", "message_bus.db-shm"]:
+        (here / name).unlink(missing_ok=True)
 
 
 @pytest.fixture(name="message_bus")
@@ -147,3 +150,57 @@ def test_iter_dataset(session, message_bus, stream_processor, job_runner):
             )
         )
         assert len(samples) == n_expected_samples
+
+
+class PredictOnly:
+    """A model without a learn method, like the fitted sklearn estimators sent by the SDK."""
+
+    def predict(self, x):
+        return True
+
+
+def test_progressive_learning_without_learn(session, message_bus, stream_processor, job_runner):
+    project = models.Project(
+        name="test_project",
+        task=enums.Task.binary_clf,
+        message_bus_name=message_bus.name,
+        stream_processor_name=stream_processor.name,
+        job_runner_name=job_runner.name,
+    )
+    project.save(session)
+
+    feature_set = models.FeatureSet(
+        name=f"{project.name}_features",
+        project_name=project.name,
+        query=f"SELECT key, created_at, value FROM messages WHERE topic = '{project.name}_features'",
+        key_field="key",
+        ts_field="created_at",
+        value_field="value",
+    )
+    feature_set.save(session)
+    project.stream_processor.infra.create_view(name=feature_set.name, query=feature_set.query)
+
+    message_bus.infra.send_many(
+        infra.Message(topic=feature_set.name, key=f"k{i}", value=json.dumps({"x": i}))
+        for i in range(3)
+    )
+
+    experiment = models.Experiment(
+        name="test_experiment",
+        project_name=project.name,
+        model=b"",
+        feature_set_name=feature_set.name,
+        start_from_top=True,
+    )
+    experiment.set_model(PredictOnly())
+    experiment.save(session)
+
+    app.dependency_overrides[db.get_session] = lambda: session
+    try:
+        logic.do_progressive_learning(experiment.name)
+        stats = logic.monitor_experiments(project.name)
+    finally:
+        app.dependency_overrides.clear()
+
+    assert stats[experiment.name]["n_predictions"] == 3
+    assert stats[experiment.name]["n_learnings"] == 0
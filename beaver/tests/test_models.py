@@ -0,0 +1,37 @@
+import dill
+
+from beaver import models
+from beaver.models.experiment import DILL_TAG, PICKLE_TAG, dump_model, load_model
+
+
+class Constant:
+    def __init__(self, value):
+        self.value = value
+
+    def predict(self, x):
+        return self.value
+
+
+def test_model_state_pickle_round_trip():
+    state = dump_model(Constant(42))
+    assert state[:1] == PICKLE_TAG
+    assert load_model(state).predict({}) == 42
+
+
+def test_model_state_falls_back_to_dill():
+    # Lambdas can't be pickled by the standard library
+    model = Constant(lambda x: x + 1)
+    state = dump_model(model)
+    assert state[:1] == DILL_TAG
+    assert load_model(state).value(1) == 2
+
+
+def test_model_state_untagged_dill():
+    state = dill.dumps(Constant(42))
+    assert load_model(state).predict({}) == 42
+
+
+def test_experiment_get_set_model():
+    experiment = models.Experiment(name="test", model=b"", feature_set_name="test")
+    experiment.set_model(Constant(42))
+    assert experiment.get_model().predict({}) == 42
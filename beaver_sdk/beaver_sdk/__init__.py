@@ -1,7 +1,7 @@
 import base64
 import dill
 import functools
-import json
+import orjson
 import urllib.parse
 import requests
 import river.base
@@ -9,6 +9,13 @@ import sklearn.base
 import types
 
 
+def _dumps(value) -> str:
+    # Same leniency as json.dumps for NumPy scalars and non-str dict keys
+    return orjson.dumps(
+        value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    ).decode()
+
+
 class SDK:
     def __init__(self, host: str):
         self.host = host
@@ -19,9 +26,8 @@ class SDK:
         return s
 
     def request(self, method, endpoint, as_json=True, session=None, **kwargs):
-        r = (session or self.session()).request(
-            method=method, url=urllib.parse.urljoin(self.host, endpoint), **kwargs
-        )
+        url = urllib.parse.urljoin(self.host, endpoint) if self.host else endpoint
+        r = (session or self.session()).request(method=method, url=url, **kwargs)
         r.raise_for_status()
         return r.json() if as_json and r.headers.get('content-type') == 'application/json' else r
 
@@ -83,7 +89,17 @@ class MessageBus(SDK):
     def send(self, topic, key, value):
         self.post(
             f"/api/message-bus/{self.name}",
-            json={"topic": topic, "key": str(key), "value": json.dumps(value)},
+            json={"topic": topic, "key": str(key), "value": _dumps(value)},
+        )
+
+    def send_many(self, messages):
+        """Send several messages in one request. Each message is a (topic, key, value) tuple."""
+        self.post(
+            f"/api/message-bus/{self.name}/bulk",
+            json=[
+                {"topic": topic, "key": str(key), "value": _dumps(value)}
+                for topic, key, value in messages
+            ],
         )
 
     def delete(self):
@@ -311,7 +327,7 @@ class ExperimentFactory(SDK):
                 "name": name,
                 "project_name": self.project_name,
                 "feature_set_name": feature_set_name,
-                "model": base64.b64encode(dill.dumps(model)).decode("ascii"),
+                "model": base64.b64encode(dill.dumps(model, protocol=5)).decode("ascii"),
                 "start_from_top": start_from_top,
             },
         )